@@ -5,6 +5,9 @@ from typing import Tuple, Set
 import pandas as pd
 
 
+_OUT_COLS = ["block_signed_at","tx_hash","from","to","value_raw"]
+
+
 def normalize_address(addr: str) -> str:
     return (addr or "").lower()
 
@@ -16,27 +19,29 @@ def infer_team_wallets_from_transfers(transfers_df: pd.DataFrame,
     Heuristic: team wallets are those that receive from creator OR from token contract
     (common for vesting mints) in the earliest window.
     """
-    df = transfers_df.copy()
-    df["from_n"] = df["from"].map(normalize_address)
-    df["to_n"] = df["to"].map(normalize_address)
-
     creator_n = normalize_address(creator_addr) if creator_addr else None
     token_n = normalize_address(token_contract)
 
-    team_like = set()
+    # Cheap pre-check on distinct senders: nothing to infer if neither source ever sends
+    senders = {a.lower() for a in transfers_df["from"].dropna().unique()}
+    if token_n not in senders and (creator_n is None or creator_n not in senders):
+        return set(), transfers_df.iloc[:0][_OUT_COLS]
 
-    # Received from creator
-    if creator_n:
-        team_like.update(df.loc[df["from_n"] == creator_n, "to_n"].dropna().tolist())
+    from_n = transfers_df["from"].fillna("").str.lower().values
+    to_n = transfers_df["to"].fillna("").str.lower().values
 
-    # Received from token contract (minting/vesting)
-    team_like.update(df.loc[df["from_n"] == token_n, "to_n"].dropna().tolist())
+    # Received from token contract (minting/vesting) or from creator, in one mask
+    from_src = from_n == token_n
+    if creator_n:
+        from_src |= from_n == creator_n
+    team_like = set(pd.unique(to_n[from_src]))
 
-    # Remove burn/zero address if present
+    # Remove burn/zero address (and missing recipients) if present
     team_like.discard("0x0000000000000000000000000000000000000000")
+    team_like.discard("")
 
     # Prepare human-readable table
-    out = df[df["to_n"].isin(team_like)].copy()
-    out = out[["block_signed_at","tx_hash","from","to","value_raw"]].sort_values("block_signed_at")
+    out = transfers_df.loc[pd.Index(to_n).isin(team_like), _OUT_COLS]
+    out = out.sort_values("block_signed_at")
 
     return team_like, out
@@ -31,9 +31,10 @@ from heuristics import (
 from utils import (
     to_excel_autofit,
     read_team_list,
-    format_pct,
     CHAIN_PRESETS,
     ensure_provider_priority,
+    disable_cache,
+    EXCEL_ENGINE,
 )
 
 
@@ -59,6 +60,8 @@ def parse_args() -> argparse.Namespace:
                    help="Output Excel filename (default: team_holdings_<token>_<date>.xlsx)")
     p.add_argument("--include-transfers", action="store_true",
                    help="Add a sheet with early transfer details (for auditability).")
+    p.add_argument("--no-cache", action="store_true",
+                   help="Bypass the on-disk cache of provider responses (~/.cache/team-holdings).")
     return p.parse_args()
 
 
@@ -74,6 +77,8 @@ def main() -> None:
 
     chain_cfg = CHAIN_PRESETS[chain]
     ensure_provider_priority(provider_pref)
+    if args.no_cache:
+        disable_cache()
 
     # Prepare output path
     date_str = datetime.now().strftime("%Y%m%d_%H%M")
@@ -87,15 +92,19 @@ def main() -> None:
     label_map = {}
     if args.label_map and os.path.exists(args.label_map):
         df_labels = pd.read_csv(args.label_map)
-        for _, row in df_labels.iterrows():
-            addr = normalize_address(str(row["address"]))
-            label_map[addr] = str(row.get("label", "")).strip()
+        addrs = df_labels["address"].astype(str).str.lower().values
+        if "label" in df_labels.columns:
+            labels = df_labels["label"].fillna("").astype(str).str.strip().values
+        else:
+            labels = [""] * len(addrs)
+        label_map = dict(zip(addrs, labels))
 
     # 1) Supply
     total_supply, token_decimals, token_name, token_symbol = fetch_total_supply(chain, token)
     if total_supply is None:
         print("ERROR: Could not fetch token total supply. Check API keys/connectivity.", file=sys.stderr)
         sys.exit(2)
+    scale = 10 ** int(token_decimals)
 
     # 2) Holders via preferred provider
     holders_df = None
@@ -109,9 +118,9 @@ def main() -> None:
         sys.exit(3)
 
     # Normalize + compute pct of supply
-    holders_df["address_n"] = holders_df["address"].map(normalize_address)
-    holders_df = holders_df.drop_duplicates(subset=["address_n"])
-    holders_df["balance_tokens"] = holders_df["balance_raw"] / (10 ** token_decimals)
+    holders_df["address_n"] = holders_df["address"].fillna("").str.lower()
+    holders_df = holders_df.drop_duplicates(subset=["address_n"], keep="first", ignore_index=True)
+    holders_df["balance_tokens"] = holders_df["balance_raw"] / scale
     holders_df["pct_total_supply"] = holders_df["balance_raw"] / total_supply
 
     # 3) Contract creation + early transfers for heuristics
@@ -130,28 +139,32 @@ def main() -> None:
 
     # 4) Label + mark team
     holders_df["label"] = holders_df["address_n"].map(label_map).fillna("")
-    holders_df["is_known_team"] = holders_df["address_n"].isin(known_team)
-    holders_df["is_inferred_team"] = holders_df["address_n"].isin(inferred_team_addrs)
-    holders_df["is_team"] = holders_df[["is_known_team","is_inferred_team"]].any(axis=1)
+    known_idx = pd.Index(list(known_team), dtype=object)
+    inferred_idx = pd.Index(list(inferred_team_addrs), dtype=object)
+    # Most runs have no team file and/or no inferred wallets: skip the hash pass then
+    holders_df["is_known_team"] = holders_df["address_n"].isin(known_idx) if len(known_idx) else False
+    holders_df["is_inferred_team"] = holders_df["address_n"].isin(inferred_idx) if len(inferred_idx) else False
+    holders_df["is_team"] = holders_df["is_known_team"].values | holders_df["is_inferred_team"].values
 
-    # 5) Summaries
-    team_df = holders_df[holders_df["is_team"]].copy()
-    nonteam_df = holders_df[~holders_df["is_team"]].copy()
+    # 5) Summaries (boolean masks over the balance column; no per-category copies)
+    bal_raw = holders_df["balance_raw"].values
+    is_team = holders_df["is_team"].values
 
     summary_rows = []
-    def add_row(name, df):
-        bal = df["balance_raw"].sum() if not df.empty else 0
+    def add_row(name, mask):
+        wallets = int(mask.sum())
+        bal = bal_raw[mask].sum() if wallets else 0
         summary_rows.append({
             "category": name,
-            "wallets": 0 if df is None else len(df),
-            "balance_tokens": bal / (10 ** token_decimals),
+            "wallets": wallets,
+            "balance_tokens": bal / scale,
             "pct_total_supply": bal / total_supply,
         })
 
-    add_row("Known team (provided)", holders_df[holders_df["is_known_team"]])
-    add_row("Inferred team (heuristics)", holders_df[holders_df["is_inferred_team"]])
-    add_row("All team (union)", team_df)
-    add_row("Non-team (others in sample)", nonteam_df)
+    add_row("Known team (provided)", holders_df["is_known_team"].values)
+    add_row("Inferred team (heuristics)", holders_df["is_inferred_team"].values)
+    add_row("All team (union)", is_team)
+    add_row("Non-team (others in sample)", ~is_team)
 
     summary_df = pd.DataFrame(summary_rows)
     meta_df = pd.DataFrame([{
@@ -159,7 +172,7 @@ def main() -> None:
         "token_symbol": token_symbol,
         "token_address": token,
         "chain": chain,
-        "total_supply_tokens": total_supply / (10 ** token_decimals),
+        "total_supply_tokens": total_supply / scale,
         "decimals": token_decimals,
         "creator_address": creator_addr or "",
         "creation_time_utc": creation_time.isoformat() if creation_time else "",
@@ -170,11 +183,12 @@ def main() -> None:
     }])
 
     # 6) Export to Excel
-    with pd.ExcelWriter(out_path, engine="openpyxl") as xw:
+    with pd.ExcelWriter(out_path, engine=EXCEL_ENGINE) as xw:
         to_excel_autofit(xw, meta_df, "Meta")
+        # Percentages stay numeric; Excel renders them via the column number format
         to_excel_autofit(xw, summary_df.assign(
-            pct_total_supply=summary_df["pct_total_supply"].map(format_pct)
-        ), "Summary")
+            pct_total_supply=pd.to_numeric(summary_df["pct_total_supply"], errors="coerce")
+        ), "Summary", pct_cols=["pct_total_supply"])
 
         cols = ["address_n","label","is_known_team","is_inferred_team","is_team",
                 "balance_tokens","pct_total_supply","tx_count"]
@@ -182,15 +196,17 @@ def main() -> None:
         if "tx_count" not in holders_df.columns:
             holders_df["tx_count"] = None
 
-        export_df = holders_df.copy()
-        export_df["pct_total_supply"] = export_df["pct_total_supply"].map(format_pct)
-        export_df = export_df.rename(columns={
+        export_df = holders_df[cols].rename(columns={
             "address_n":"address",
         })
-        to_excel_autofit(xw, export_df[cols], "Wallets")
+        export_df["pct_total_supply"] = pd.to_numeric(export_df["pct_total_supply"], errors="coerce")
+        to_excel_autofit(xw, export_df, "Wallets", pct_cols=["pct_total_supply"])
 
         if args.include_transfers and early_transfers_df is not None and not early_transfers_df.empty:
-            to_excel_autofit(xw, early_transfers_df, "EarlyTransfers")
+            # Excel can't store tz-aware datetimes; timestamps are UTC
+            to_excel_autofit(xw, early_transfers_df.assign(
+                block_signed_at=early_transfers_df["block_signed_at"].dt.tz_localize(None)
+            ), "EarlyTransfers")
 
         # Methodology sheet
         methodology = [
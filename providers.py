@@ -1,13 +1,34 @@
 # -*- coding: utf-8 -*-
+import math
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from typing import Optional, Tuple
 
+import numpy as np
 import requests
 import pandas as pd
+from requests.adapters import HTTPAdapter
 
-from utils import CHAIN_PRESETS, normalize_hex, safe_get
+try:
+    import orjson
+except ImportError:  # optional: stdlib json via requests is used instead
+    orjson = None
+
+from utils import CHAIN_PRESETS, HOLDERS_CACHE_TTL, disk_cached, normalize_hex, safe_get, safe_get2
+
+
+# Shared session: keeps TLS connections to each provider alive across calls.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
+_SESSION.mount("http://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
+_MAX_WORKERS = 4
+
+
+def _json(r: requests.Response):
+    # Holders/events payloads can be several MB; orjson parses them much faster
+    return orjson.loads(r.content) if orjson is not None else r.json()
 
 
 def _auth_header_covalent():
@@ -15,6 +36,7 @@ def _auth_header_covalent():
     return {"Authorization": f"Bearer {key}"} if key else {}
 
 
+@disk_cached(ttl=HOLDERS_CACHE_TTL)
 def fetch_total_supply(chain: str, token: str):
     """
     Try Covalent first (rich metadata), fallback to Ethplorer (Ethereum only).
@@ -25,10 +47,10 @@ def fetch_total_supply(chain: str, token: str):
     if cov_key:
         cfg = CHAIN_PRESETS[chain]
         url = f"https://api.covalenthq.com/v1/{cfg['covalent_chain']}/tokens/{token}/token_holders/?page-size=1"
-        r = requests.get(url, headers=_auth_header_covalent(), timeout=30)
+        r = _SESSION.get(url, headers=_auth_header_covalent(), timeout=30)
         if r.ok:
-            data = r.json()
-            items = safe_get(data, ["data","items"], [])
+            data = _json(r)
+            items = safe_get2(data, "data", "items", [])
             if items:
                 meta = safe_get(items, [0,"contract_metadata"], {})
                 sup = normalize_hex(meta.get("total_supply")) if meta else None
@@ -42,9 +64,9 @@ def fetch_total_supply(chain: str, token: str):
     eth_key = os.getenv("ETHPLORER_API_KEY", "freekey").strip() or "freekey"
     if chain == "ethereum":
         url = f"https://api.ethplorer.io/getTokenInfo/{token}?apiKey={eth_key}"
-        r = requests.get(url, timeout=30)
+        r = _SESSION.get(url, timeout=30)
         if r.ok:
-            j = r.json()
+            j = _json(r)
             sup = j.get("totalSupply")
             dec = j.get("decimals", 18)
             name = j.get("name","")
@@ -62,43 +84,51 @@ def fetch_total_supply(chain: str, token: str):
     return None, None, None, None
 
 
+@disk_cached(ttl=HOLDERS_CACHE_TTL)
 def fetch_token_holders_covalent(chain: str, token: str, top_n: int = 500) -> Optional[pd.DataFrame]:
     key = os.getenv("COVALENT_API_KEY","").strip()
     if not key:
         return None
     cfg = CHAIN_PRESETS[chain]
     url = f"https://api.covalenthq.com/v1/{cfg['covalent_chain']}/tokens/{token}/token_holders/?page-size={min(top_n,10000)}"
-    r = requests.get(url, headers=_auth_header_covalent(), timeout=60)
+    r = _SESSION.get(url, headers=_auth_header_covalent(), timeout=60)
     if not r.ok:
         return None
-    data = r.json()
-    items = safe_get(data, ["data","items"], [])
-    rows = []
-    seen = set()
+    data = _json(r)
+    items = safe_get2(data, "data", "items", [])
+    # Fill preallocated columns rather than building a dict per holder
+    n = min(len(items), top_n)
+    addrs = np.empty(n, dtype=object)
+    bals = np.empty(n, dtype=object)  # raw balances can exceed int64
+    txs = np.empty(n, dtype=object)
+    k = 0
+    # Duplicates are dropped once, on the normalized address, in main
     for it in items[:top_n]:
         addr = it.get("address")
-        if not addr or addr in seen:
+        if not addr:
             continue
-        seen.add(addr)
-        bal_hex = normalize_hex(safe_get(it, ["balance"]))
-        txs = it.get("transfer_count")
-        rows.append({
-            "address": addr,
-            "balance_raw": int(bal_hex) if bal_hex is not None else 0,
-            "tx_count": txs,
-        })
-    return pd.DataFrame(rows)
+        bal_hex = normalize_hex(it.get("balance"))
+        addrs[k] = addr
+        bals[k] = int(bal_hex) if bal_hex is not None else 0
+        txs[k] = it.get("transfer_count")
+        k += 1
+    return pd.DataFrame({
+        "address": addrs[:k],
+        "balance_raw": bals[:k],
+        "tx_count": txs[:k],
+    })
 
 
+@disk_cached(ttl=HOLDERS_CACHE_TTL)
 def fetch_token_holders_ethplorer(chain: str, token: str, top_n: int = 500) -> Optional[pd.DataFrame]:
     if chain != "ethereum":
         return None
     key = os.getenv("ETHPLORER_API_KEY", "freekey").strip() or "freekey"
     url = f"https://api.ethplorer.io/getTopTokenHolders/{token}?apiKey={key}&limit={min(top_n,1000)}"
-    r = requests.get(url, timeout=60)
+    r = _SESSION.get(url, timeout=60)
     if not r.ok:
         return None
-    j = r.json()
+    j = _json(r)
     holders = j.get("holders", [])
     rows = []
     for h in holders[:top_n]:
@@ -110,6 +140,38 @@ def fetch_token_holders_ethplorer(chain: str, token: str, top_n: int = 500) -> O
     return pd.DataFrame(rows)
 
 
+def _parse_transfer_events(evs, cols) -> None:
+    # Column-wise (one list per field) so the frame is built without per-row dicts
+    ts_list, hash_list = cols["block_signed_at"], cols["tx_hash"]
+    from_list, to_list, val_list = cols["from"], cols["to"], cols["value_raw"]
+    for e in evs:
+        # Covalent decodes params
+        decoded = e.get("decoded", {})
+        dec = decoded.get("params", [])
+        p = {prm.get("name"): prm.get("value") for prm in dec}
+        fr = p.get("from")
+        to = p.get("to")
+        v = p.get("value")
+        try:
+            val = int(v) if v is not None else None
+        except (TypeError, ValueError):
+            val = None
+        ts_list.append(e.get("block_signed_at"))
+        hash_list.append(e.get("tx_hash"))
+        from_list.append(fr)
+        to_list.append(to)
+        val_list.append(val)
+
+
+def _transfers_frame(cols) -> pd.DataFrame:
+    if not cols["tx_hash"]:
+        return pd.DataFrame()
+    df = pd.DataFrame(cols)
+    # Parse ISO timestamps once so sorting compares int64 instead of strings
+    df["block_signed_at"] = pd.to_datetime(df["block_signed_at"], utc=True, format="ISO8601", errors="coerce")
+    return df
+
+
 def fetch_token_transfers_covalent(chain: str, token: str,
                                    start_time: Optional[datetime]=None,
                                    end_time: Optional[datetime]=None,
@@ -133,47 +195,68 @@ def fetch_token_transfers_covalent(chain: str, token: str,
         "to-date": end_time.strftime("%Y-%m-%d") if end_time else "",
         "key": key  # legacy param still accepted; also support header
     }
-    rows = []
-    for page in range(1, max_pages+1):
-        params["page-number"] = page
-        r = requests.get(base, params=params, headers=_auth_header_covalent(), timeout=60)
+
+    def get_page(page: int):
+        r = _SESSION.get(base, params={**params, "page-number": page},
+                         headers=_auth_header_covalent(), timeout=60)
+        return _json(r) if r.ok else None
+
+    cols = {"block_signed_at": [], "tx_hash": [], "from": [], "to": [], "value_raw": []}
+    data = get_page(1)
+    if data is None:
+        return pd.DataFrame()
+    evs = safe_get2(data, "data", "items", [])
+    _parse_transfer_events(evs, cols)
+
+    # Stop early if first page size less than page-size
+    if len(evs) < 1000 or max_pages <= 1:
+        return _transfers_frame(cols)
+
+    total_count = safe_get(data, ["data","pagination","total_count"])
+    if total_count:
+        # Page count known up front: fetch the rest concurrently, keeping page order
+        last_page = min(max_pages, math.ceil(int(total_count) / 1000))
+        with ThreadPoolExecutor(max_workers=_MAX_WORKERS) as ex:
+            for data in ex.map(get_page, range(2, last_page+1)):
+                evs = safe_get2(data, "data", "items", [])
+                if not evs:
+                    break
+                _parse_transfer_events(evs, cols)
+    else:
+        for page in range(2, max_pages+1):
+            time.sleep(0.2)
+            data = get_page(page)
+            if data is None:
+                break
+            evs = safe_get2(data, "data", "items", [])
+            if not evs:
+                break
+            _parse_transfer_events(evs, cols)
+            if len(evs) < 1000:
+                break
+    return _transfers_frame(cols)
+
+
+def _etherscan_proxy_batch(base: str, api_key: str, calls) -> Optional[dict]:
+    """
+    POST several proxy (JSON-RPC) calls as one batch.
+    Returns: {id: result} with ids starting at 1, or None if the batch was rejected.
+    """
+    body = [{"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+            for i, (method, params) in enumerate(calls, start=1)]
+    try:
+        r = _SESSION.post(f"{base}?module=proxy&apikey={api_key}", json=body, timeout=30)
         if not r.ok:
-            break
-        data = r.json()
-        evs = data.get("data", {}).get("items", [])
-        if not evs:
-            break
-        for e in evs:
-            # Covalent decodes params
-            decoded = e.get("decoded", {})
-            dec = decoded.get("params", [])
-            fr = None; to = None; val = None
-            for prm in dec:
-                if prm.get("name") == "from":
-                    fr = prm.get("value")
-                elif prm.get("name") == "to":
-                    to = prm.get("value")
-                elif prm.get("name") == "value":
-                    v = prm.get("value")
-                    try:
-                        val = int(v)
-                    except Exception:
-                        val = None
-            ts = e.get("block_signed_at")
-            rows.append({
-                "block_signed_at": ts,
-                "tx_hash": e.get("tx_hash"),
-                "from": fr,
-                "to": to,
-                "value_raw": val,
-            })
-        # Stop early if last page size less than page-size
-        if len(evs) < 1000:
-            break
-        time.sleep(0.2)
-    return pd.DataFrame(rows) if rows else pd.DataFrame()
+            return None
+        j = _json(r)
+    except Exception:
+        return None
+    if not isinstance(j, list):
+        return None
+    return {it.get("id"): it.get("result") for it in j if isinstance(it, dict)}
 
 
+@disk_cached(ttl=None)
 def get_contract_creation_tx_etherscan(chain: str, token: str) -> Tuple[Optional[str], Optional[datetime]]:
     cfg = CHAIN_PRESETS[chain]
     base = cfg["explorer_api"]
@@ -183,37 +266,43 @@ def get_contract_creation_tx_etherscan(chain: str, token: str) -> Tuple[Optional
         return None, None
     # Etherscan-compatible "getcontractcreation" (for contracts) via 'contract' module
     url = f"{base}?module=contract&action=getcontractcreation&contractaddresses={token}&apikey={api_key}"
-    r = requests.get(url, timeout=30)
+    r = _SESSION.get(url, timeout=30)
     if not r.ok:
         return None, None
-    j = r.json()
+    j = _json(r)
     res = j.get("result", [])
     if not res:
         return None, None
     creator = res[0].get("contractCreator")
     tx_hash = res[0].get("txHash")
-    # Fetch tx to get timestamp
-    url2 = f"{base}?module=proxy&action=eth_getTransactionByHash&txhash={tx_hash}&apikey={api_key}"
-    r2 = requests.get(url2, timeout=30)
-    if not r2.ok:
-        return creator, None
-    j2 = r2.json()
-    # Some explorers don't return timestamp here; use tx receipt block then get block time
-    # Get receipt for block number
-    url3 = f"{base}?module=proxy&action=eth_getTransactionReceipt&txhash={tx_hash}&apikey={api_key}"
-    r3 = requests.get(url3, timeout=30)
-    if not r3.ok:
-        return creator, None
-    j3 = r3.json()
+    # Fetch tx and its receipt (for block number) in one JSON-RPC batch; some
+    # explorers don't return a timestamp on the tx, so block time is looked up afterwards
+    batch = _etherscan_proxy_batch(base, api_key, [
+        ("eth_getTransactionByHash", [tx_hash]),
+        ("eth_getTransactionReceipt", [tx_hash]),
+    ])
+    if batch is not None and batch.get(1) and batch.get(2):
+        j3 = {"result": batch[2]}
+    else:
+        # Not every explorer accepts batches; fall back to two concurrent GETs
+        url2 = f"{base}?module=proxy&action=eth_getTransactionByHash&txhash={tx_hash}&apikey={api_key}"
+        url3 = f"{base}?module=proxy&action=eth_getTransactionReceipt&txhash={tx_hash}&apikey={api_key}"
+        with ThreadPoolExecutor(max_workers=2) as ex:
+            f2 = ex.submit(_SESSION.get, url2, timeout=30)
+            f3 = ex.submit(_SESSION.get, url3, timeout=30)
+            r2, r3 = f2.result(), f3.result()
+        if not r2.ok or not r3.ok:
+            return creator, None
+        j3 = _json(r3)
     block_hex = j3.get("result", {}).get("blockNumber")
     if not block_hex:
         return creator, None
     # Block by number
     url4 = f"{base}?module=proxy&action=eth_getBlockByNumber&tag={block_hex}&boolean=true&apikey={api_key}"
-    r4 = requests.get(url4, timeout=30)
+    r4 = _SESSION.get(url4, timeout=30)
     if not r4.ok:
         return creator, None
-    j4 = r4.json()
+    j4 = _json(r4)
     ts_hex = j4.get("result", {}).get("timestamp")
     if not ts_hex:
         return creator, None
@@ -1,9 +1,31 @@
 # -*- coding: utf-8 -*-
+import functools
 import os
-from typing import Any, List, Dict
+from typing import Any, List, Dict, Optional
 
 import pandas as pd
 
+try:
+    import diskcache
+except ImportError:  # optional: without it provider results are simply not cached
+    diskcache = None
+
+try:
+    import xlsxwriter  # noqa: F401
+    EXCEL_ENGINE = "xlsxwriter"
+except ImportError:  # openpyxl works too, just slower and heavier on big sheets
+    EXCEL_ENGINE = "openpyxl"
+
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "team-holdings")
+HOLDERS_CACHE_TTL = 10 * 60  # seconds; holders/supply drift, creation info doesn't
+
+PCT_FORMAT = "0.0000%"  # Excel number format for share-of-supply columns
+
+_cache = None
+_cache_enabled = True
+_MISS = object()
+
 
 CHAIN_PRESETS = {
     # You can extend with more chains later (bsc, polygon, etc.).
@@ -52,28 +74,44 @@ def read_team_list(path: str) -> List[str]:
     return addrs
 
 
-def to_excel_autofit(xw, df: pd.DataFrame, sheet_name: str):
+def to_excel_autofit(xw, df: pd.DataFrame, sheet_name: str, pct_cols: List[str] = ()):
     df.to_excel(xw, sheet_name=sheet_name, index=False)
-    # Best-effort: let Excel handle widths; openpyxl autosize isn't reliable without heavy loops.
+    ws = xw.sheets[sheet_name]
+    # Width from one vectorized string-length pass per column (capped), not per-cell loops
+    widths = []
+    for col in df.columns:
+        lens = df[col].astype(str).str.len().fillna(0)
+        longest = int(lens.max()) if len(lens) else 0
+        widths.append(min(max(len(str(col)), longest) + 2, 60))
+    if xw.engine == "xlsxwriter":
+        pct_fmt = xw.book.add_format({"num_format": PCT_FORMAT}) if pct_cols else None
+        for i, col in enumerate(df.columns):
+            ws.set_column(i, i, widths[i], pct_fmt if col in pct_cols else None)
+    else:
+        from openpyxl.utils import get_column_letter
+        for i, col in enumerate(df.columns):
+            ws.column_dimensions[get_column_letter(i+1)].width = widths[i]
+            if col in pct_cols:
+                for (cell,) in ws.iter_rows(min_row=2, min_col=i+1, max_col=i+1):
+                    cell.number_format = PCT_FORMAT
 
 
-def format_pct(x: float) -> str:
+@functools.lru_cache(maxsize=8192)
+def _hex_to_int(s: str) -> Optional[int]:
+    # Balances/values repeat a lot (0x0, round amounts, vesting tranches)
+    if s.startswith("0x"):
+        return int(s, 16)
     try:
-        return f"{x*100:.4f}%"
+        return int(s)
     except Exception:
-        return ""
+        return None
 
 
 def normalize_hex(v: Any):
     if v is None:
         return None
     if isinstance(v, str):
-        if v.startswith("0x"):
-            return int(v, 16)
-        try:
-            return int(v)
-        except Exception:
-            return None
+        return _hex_to_int(v)
     if isinstance(v, (int, float)):
         try:
             return int(v)
@@ -90,3 +128,57 @@ def safe_get(obj: Dict, path: List[str], default=None):
         else:
             return default
     return cur
+
+
+def disable_cache() -> None:
+    global _cache_enabled
+    _cache_enabled = False
+
+
+def _get_cache():
+    global _cache
+    if not _cache_enabled or diskcache is None:
+        return None
+    if _cache is None:
+        _cache = diskcache.Cache(CACHE_DIR)
+    return _cache
+
+
+def _is_cacheable(res: Any) -> bool:
+    # Never persist failed/partial lookups, so a transient API error isn't frozen in
+    if res is None:
+        return False
+    if isinstance(res, tuple):
+        return all(x is not None for x in res)
+    if isinstance(res, pd.DataFrame):
+        return not res.empty
+    return True
+
+
+def disk_cached(ttl: Optional[float] = None):
+    """
+    Cache a provider call `fn(chain, token, ...)` on disk, keyed on
+    (chain, token, function name, args). ttl=None means never expire.
+    """
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(chain: str, token: str, *args, **kwargs):
+            cache = _get_cache()
+            if cache is None:
+                return fn(chain, token, *args, **kwargs)
+            key = (chain, token.lower(), fn.__name__, args, tuple(sorted(kwargs.items())))
+            res = cache.get(key, default=_MISS)
+            if res is not _MISS:
+                return res
+            res = fn(chain, token, *args, **kwargs)
+            if _is_cacheable(res):
+                cache.set(key, res, expire=ttl)
+            return res
+        return wrapper
+    return deco
+
+
+def safe_get2(obj: Dict, k1, k2, default=None):
+    # Two-level safe_get without the path loop, for per-response/per-item parsing
+    x = obj.get(k1) if isinstance(obj, dict) else None
+    return x.get(k2, default) if isinstance(x, dict) else default